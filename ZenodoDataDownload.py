@@ -1,31 +1,193 @@
 import requests
+import ctypes
+import glob
+import io
+import json
 import os
+import random
+import socket
+import struct
 import sys
 import time
 import re
+import sched
+import threading
+from concurrent.futures import FIRST_COMPLETED, FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
 
 # Try to import tqdm for progress bar, otherwise define a simple alternative
 try:
     from tqdm import tqdm
 except ImportError:
     class tqdm:
-        def __init__(self, total=None, unit='B', unit_scale=True, desc=None, disable=False, initial=0):
+        def __init__(self, total=None, unit='B', unit_scale=True, desc=None, disable=False, initial=0,
+                     mininterval=1, maxinterval=None, miniters=None):
             self.total = total
             self.n = initial
             self.desc = desc
+            self.mininterval = mininterval
             self.last_print = 0
 
         def update(self, n=1):
             self.n += n
-            current_time = time.time()
-            if current_time - self.last_print > 1 or self.n == self.total:
-                print(f"\r{self.desc}: {self.n}/{self.total} bytes downloaded", end="")
-                self.last_print = current_time
+            if time.time() - self.last_print > self.mininterval or self.n == self.total:
+                self.refresh()
+
+        def refresh(self):
+            print(f"\r{self.desc}: {self.n}/{self.total} bytes downloaded", end="")
+            self.last_print = time.time()
         
         def close(self):
             print()
 
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.close()
+
+# Use orjson for parsing (large) record metadata when available
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+def env_int(name, default):
+    """
+    Read a positive integer setting from an environment variable
+    """
+    value = os.environ.get(name, '').strip()
+    if value.isdigit() and int(value) > 0:
+        return int(value)
+    return default
+
+# Bytes read from the HTTP stream per iteration (override with ZENODO_CHUNK_SIZE)
+DOWNLOAD_CHUNK_SIZE = env_int('ZENODO_CHUNK_SIZE', 1 << 20)
+# Number of files downloaded concurrently (override with ZENODO_WORKERS)
+DOWNLOAD_WORKERS = env_int('ZENODO_WORKERS', min(32, (os.cpu_count() or 1) * 4))
+# Upper bound on simultaneous HTTP streams across all files and byte ranges,
+# so zenodo.org does not rate-limit us (override with ZENODO_MAX_CONNECTIONS)
+MAX_CONNECTIONS = env_int('ZENODO_MAX_CONNECTIONS', 16)
+CONNECTION_SLOTS = threading.BoundedSemaphore(MAX_CONNECTIONS)
+# Set on Ctrl+C; in-flight downloads stop at their next chunk
+CANCEL = threading.Event()
+# Progress bars redraw at most every half second, and are fed in bulk
+PROGRESS_OPTIONS = dict(unit='B', unit_scale=True, mininterval=0.5, maxinterval=2.0, miniters=1024 * 1024)
+PROGRESS_UPDATE_BYTES = 256 * 1024
+# Files at least this large are fetched as parallel byte ranges when the server allows it
+RANGED_DOWNLOAD_MIN_SIZE = 64 * 1024 * 1024
+# Number of concurrent byte ranges per large file (override with ZENODO_RANGE_PARTS)
+RANGED_DOWNLOAD_PARTS = env_int('ZENODO_RANGE_PARTS', 8)
+# Record metadata is cached in the download directory and trusted for an hour
+METADATA_CACHE_NAME = '.zenodo_metadata.json'
+METADATA_CACHE_TTL = 3600
+# Record page URLs, old (/record/) and new (/records/) style
+RECORD_URL_PATTERN = re.compile(r'zenodo\.org/records?/(\d+)')
+# Characters not allowed in the download directory name. Only letters, digits,
+# space, '-' and '_' are kept; see sanitize_title for non-ASCII titles
+UNSAFE_TITLE_CHARS = re.compile(r'[^\w \-]+')
+# Kernel receive buffer requested for each download socket, where it helps
+SOCKET_RECEIVE_BUFFER = 16 * 1024 * 1024
+
+def socket_receive_buffer():
+    """
+    Receive buffer size to set explicitly, or None to leave it to the kernel.
+    On Linux an explicit SO_RCVBUF disables autotuning and is capped at
+    net.core.rmem_max, so it is only worth setting when it is allowed to
+    exceed the autotuning ceiling (the last field of net.ipv4.tcp_rmem).
+    """
+    if not sys.platform.startswith('linux'):
+        return SOCKET_RECEIVE_BUFFER
+    try:
+        with open('/proc/sys/net/ipv4/tcp_rmem') as f:
+            autotune_max = int(f.read().split()[2])
+        with open('/proc/sys/net/core/rmem_max') as f:
+            rmem_max = int(f.read())
+    except (OSError, ValueError, IndexError):
+        return None
+    if autotune_max < SOCKET_RECEIVE_BUFFER <= rmem_max:
+        return SOCKET_RECEIVE_BUFFER
+    return None
+
+class LargeBufferAdapter(HTTPAdapter):
+    """
+    HTTP adapter whose sockets use a large receive buffer, so TCP can keep a
+    wide window open on high-latency links to zenodo.org
+    """
+    def init_poolmanager(self, *args, **kwargs):
+        options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        receive_buffer = socket_receive_buffer()
+        if receive_buffer:
+            options.append((socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer))
+        kwargs['socket_options'] = options
+        super().init_poolmanager(*args, **kwargs)
+
+# One keep-alive session shared by the metadata request and all download workers,
+# so TLS connections are reused instead of renegotiated for every request.
+# The pool holds one connection per concurrent stream (MAX_CONNECTIONS),
+# otherwise finished connections are discarded and new handshakes are needed.
+SESSION = requests.Session()
+_adapter = LargeBufferAdapter(pool_connections=32, pool_maxsize=MAX_CONNECTIONS, max_retries=0)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
+class DownloadCancelled(Exception):
+    """
+    Raised inside a download when the user interrupted the script
+    """
+
+def backoff_delay(attempt, base, cap):
+    """
+    Truncated exponential backoff with full jitter for the given attempt (1-based)
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+def preallocate_file(f, size):
+    """
+    Reserve disk space for a file being written without changing its apparent
+    size, so the size-based resume checks keep working. Best effort only.
+    """
+    try:
+        if sys.platform.startswith('linux'):
+            libc = ctypes.CDLL(None, use_errno=True)
+            fallocate = getattr(libc, 'fallocate64', None) or libc.fallocate
+            fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+            FALLOC_FL_KEEP_SIZE = 0x01
+            fallocate(f.fileno(), FALLOC_FL_KEEP_SIZE, 0, size)
+        elif sys.platform == 'darwin':
+            import fcntl
+            F_PREALLOCATE, F_ALLOCATEALL, F_PEOFPOSMODE = 42, 0x04, 3
+            # fstore_t: flags, posmode, offset, length, bytesalloc
+            fstore = struct.pack('Iiqqq', F_ALLOCATEALL, F_PEOFPOSMODE, 0, size, 0)
+            fcntl.fcntl(f.fileno(), F_PREALLOCATE, fstore)
+    except (AttributeError, OSError):
+        pass
+
+def copy_stream(src, dst, length=DOWNLOAD_CHUNK_SIZE):
+    """
+    Copy a readable stream into an unbuffered file, one write(2) per chunk.
+    Short writes are continued so no bytes are silently dropped.
+    """
+    while True:
+        if CANCEL.is_set():
+            raise DownloadCancelled()
+        chunk = src.read(length)
+        if not chunk:
+            break
+        view = memoryview(chunk)
+        while view:
+            view = view[dst.write(view):]
+
+def track_progress(pbar, f, stop, interval=0.5):
+    """
+    Mirror the on-disk size of an open file onto a progress bar until stop is set
+    """
+    while not stop.wait(interval):
+        pbar.n = os.fstat(f.fileno()).st_size
+        pbar.refresh()
+
 def get_record_id(input_str):
     """
     Extract Zenodo Record ID from input URL or string
@@ -37,40 +199,344 @@ def get_record_id(input_str):
         return input_str
     
     # Match /record/1234567 or /records/1234567
-    match = re.search(r'zenodo\.org/record/(\d+)', input_str)
-    if match:
-        return match.group(1)
-    
-    match = re.search(r'zenodo\.org/records/(\d+)', input_str)
-    if match:
-        return match.group(1)
-        
-    return None
+    match = RECORD_URL_PATTERN.search(input_str)
+    return match.group(1) if match else None
+
+def sanitize_title(title):
+    """
+    Reduce a dataset title to characters that are safe in a directory name
+    """
+    title = UNSAFE_TITLE_CHARS.sub('', title)
+    # \w also matches numeric characters that are neither letters nor digits
+    # (e.g. '½', 'Ⅻ'); drop those so existing directory names stay the same
+    try:
+        title.encode('ascii')
+    except UnicodeEncodeError:
+        title = ''.join(c for c in title if c.isalpha() or c.isdigit() or c in (' ', '-', '_'))
+    return title.strip()
 
-def get_record_metadata(record_id):
+def find_metadata_cache(record_id):
     """
-    Get Zenodo record metadata
+    Locate the metadata cache left in an earlier download directory of this record
+    """
+    pattern = os.path.join(glob.escape(os.getcwd()), f"Zenodo_{record_id}_*", METADATA_CACHE_NAME)
+    matches = glob.glob(pattern)
+    return max(matches, key=os.path.getmtime) if matches else None
+
+def load_metadata_cache(cache_path):
     """
+    Read a cached {'etag': ..., 'metadata': ...} entry, or None if unusable
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or 'metadata' not in cached:
+        return None
+    return cached
+
+def save_metadata_cache(cache_path, metadata, etag=None):
+    """
+    Store record metadata (and its ETag) for later runs
+    """
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'etag': etag, 'metadata': metadata}, f)
+    except OSError as e:
+        print(f"Failed to cache metadata: {e}")
+
+def get_record_metadata(record_id, cache_path=None):
+    """
+    Get Zenodo record metadata, using the on-disk cache at cache_path when fresh.
+    Returns (metadata, etag); metadata is None if it could not be fetched.
+    """
+    cached = load_metadata_cache(cache_path) if cache_path else None
+    if cached and time.time() - os.path.getmtime(cache_path) < METADATA_CACHE_TTL:
+        print(f"Using cached metadata: {cache_path}")
+        return cached['metadata'], cached.get('etag')
+
     api_url = f"https://zenodo.org/api/records/{record_id}"
     print(f"Fetching metadata: {api_url}")
+    headers = {}
+    if cached and cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
     try:
-        response = requests.get(api_url, timeout=15)
+        response = SESSION.get(api_url, headers=headers, timeout=15)
+        if cached and response.status_code == 304:
+            # Unchanged since it was cached; restart the TTL. The cached
+            # metadata is still valid if the timestamp cannot be updated
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return cached['metadata'], cached.get('etag')
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        metadata = json_loads(response.content)
+    except (requests.exceptions.RequestException, ValueError) as e:
         print(f"Failed to fetch metadata: {e}")
+        if cached:
+            print(f"Using stale cached metadata: {cache_path}")
+            return cached['metadata'], cached.get('etag')
+        return None, None
+
+    etag = response.headers.get('ETag')
+    if cache_path:
+        save_metadata_cache(cache_path, metadata, etag)
+    return metadata, etag
+
+def has_content_encoding(response):
+    """
+    Whether the response body is compressed in transit (gzip, deflate, ...)
+    """
+    return response.headers.get('content-encoding', 'identity').strip().lower() not in ('', 'identity')
+
+def probe_file(url):
+    """
+    HEAD a download URL and return (size, accepts_ranges).
+    Both are None if the request fails; size is None if the server does not report it.
+    """
+    try:
+        with CONNECTION_SLOTS:
+            head = SESSION.head(url, allow_redirects=True, timeout=15)
+        head.raise_for_status()
+    except requests.exceptions.RequestException:
+        return None, None
+    length = head.headers.get('content-length', '')
+    size = int(length) if length.isdigit() and not has_content_encoding(head) else None
+    return size, head.headers.get('accept-ranges', '').lower() == 'bytes'
+
+class RangesUnsupported(Exception):
+    """
+    Raised when the server stops honouring byte ranges, or the file changed
+    """
+
+def load_range_state(state_path, size):
+    """
+    Read the saved progress of a ranged download, or None if missing or stale
+    """
+    try:
+        with open(state_path, 'rb') as f:
+            state = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('size') != size or not isinstance(state.get('ranges'), list):
         return None
+    return state
+
+def save_range_state(state_path, state):
+    """
+    Atomically store the progress of a ranged download
+    """
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
 
-def download_file(url, filename, output_dir, expected_size=None, max_retries=5):
+def discard_ranged_download(part_path, state_path):
+    """
+    Remove the partial file and saved progress of a ranged download
+    """
+    for path in (part_path, state_path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def download_file_ranged(url, filepath, size, parts=8, accepts_ranges=None, max_retries=5):
+    """
+    Download a file as concurrent HTTP Range requests written in place.
+    The URL is probed first unless accepts_ranges is already known.
+    Progress is kept in a .part file plus a .ranges sidecar, so an interrupted
+    ranged download resumes where each range left off.
+    Returns True when complete, False if it failed but can be resumed, and
+    None if byte ranges cannot be used, so the caller falls back to a single stream.
+    """
+    if not hasattr(os, 'pwrite'):
+        return None
+
+    filename = os.path.basename(filepath)
+    # A half-finished ranged download lives next to the target, never in it,
+    # so it is not mistaken for a complete (or single-stream resumable) file
+    part_path = filepath + '.part'
+    state_path = filepath + '.ranges'
+
+    state = load_range_state(state_path, size)
+    if state is not None and not (os.path.exists(part_path) and os.path.getsize(part_path) == size):
+        state = None
+
+    if accepts_ranges is None:
+        probed_size, accepts_ranges = probe_file(url)
+        if accepts_ranges and probed_size != size:
+            accepts_ranges = False if probed_size is not None else None
+    if accepts_ranges is False:
+        # The server clearly cannot serve this file in ranges (any more)
+        discard_ranged_download(part_path, state_path)
+        return None
+    if accepts_ranges is None and state is None:
+        # Probe failed or was inconclusive, and there is nothing to resume
+        return None
+    # A failed probe does not invalidate saved progress: every range request
+    # carries If-Range, so a changed file is still detected
+
+    if state is not None:
+        print(f"Resuming ranged download: {filename}")
+        fd = os.open(part_path, os.O_WRONLY)
+    else:
+        # Contiguous byte ranges as [next offset, inclusive end]
+        part_size = -(-size // parts)
+        state = {
+            'size': size,
+            'etag': None,
+            'ranges': [[start, min(start + part_size, size) - 1] for start in range(0, size, part_size)],
+        }
+        fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except (AttributeError, OSError):
+            os.ftruncate(fd, size)
+        save_range_state(state_path, state)
+
+    ranges = state['ranges']
+    remaining = sum(end + 1 - start for start, end in ranges if start <= end)
+    lock = threading.Lock()
+    # Set when one range has failed for good, so the others stop early
+    stop = threading.Event()
+    last_save = time.monotonic()
+
+    def fetch_range(index):
+        nonlocal last_save
+        attempt = 0
+        while True:
+            if stop.is_set() or CANCEL.is_set():
+                raise DownloadCancelled()
+            start, end = ranges[index]
+            if start > end:
+                return
+            headers = {'Range': f'bytes={start}-{end}'}
+            if state['etag']:
+                headers['If-Range'] = state['etag']
+            unreported = 0
+            try:
+                with CONNECTION_SLOTS:
+                    # Waiting for a slot can take a while; do not start a request after a stop
+                    if stop.is_set() or CANCEL.is_set():
+                        raise DownloadCancelled()
+                    with SESSION.get(url, headers=headers, stream=True, timeout=30) as r:
+                        r.raise_for_status()
+                        if r.status_code != 206:
+                            raise RangesUnsupported("Server ignored Range request or the file changed")
+                        if has_content_encoding(r):
+                            raise RangesUnsupported("Server compressed a Range response")
+                        etag = r.headers.get('ETag')
+                        with lock:
+                            if state['etag'] is None and etag and not etag.startswith('W/'):
+                                state['etag'] = etag
+
+                        offset = start
+                        while True:
+                            if stop.is_set() or CANCEL.is_set():
+                                raise DownloadCancelled()
+                            chunk = r.raw.read(DOWNLOAD_CHUNK_SIZE, decode_content=False)
+                            if not chunk:
+                                break
+                            n = len(chunk)
+                            if offset + n > end + 1:
+                                raise Exception(f"Server sent more than range {start}-{end}")
+                            view = memoryview(chunk)
+                            while view:
+                                written = os.pwrite(fd, view, offset)
+                                offset += written
+                                view = view[written:]
+                            unreported += n
+                            with lock:
+                                ranges[index][0] = offset
+                                if unreported >= PROGRESS_UPDATE_BYTES:
+                                    pbar.update(unreported)
+                                    unreported = 0
+                                # Persist progress about once a second for resuming after a crash
+                                if time.monotonic() - last_save >= 1:
+                                    save_range_state(state_path, state)
+                                    last_save = time.monotonic()
+                if offset != end + 1:
+                    raise Exception(f"Range {start}-{end} ended at byte {offset}")
+                return
+            except (RangesUnsupported, DownloadCancelled):
+                raise
+            except Exception as e:
+                attempt += 1
+                if attempt >= max_retries:
+                    raise
+                delay = backoff_delay(attempt, base=2.0, cap=60.0)
+                print(f"\nRange {index + 1}/{len(ranges)} of {filename} failed ({attempt}/{max_retries}), "
+                      f"retrying in {delay:.1f} seconds: {e}")
+                if stop.wait(delay):
+                    raise DownloadCancelled()
+            finally:
+                with lock:
+                    pbar.update(unreported)
+
+    errors = []
+    try:
+        with tqdm(total=size, desc=filename, initial=size - remaining, **PROGRESS_OPTIONS) as pbar:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(fetch_range, index) for index in range(len(ranges))]
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=0.5, return_when=FIRST_EXCEPTION)
+                    if CANCEL.is_set() or any(not future.cancelled() and future.exception() for future in done):
+                        # Stop the remaining ranges at their next chunk
+                        stop.set()
+                        for future in pending:
+                            future.cancel()
+            errors = [future.exception() for future in futures
+                      if not future.cancelled() and future.exception()]
+    finally:
+        os.close(fd)
+
+    if not errors and all(start > end for start, end in ranges):
+        os.replace(part_path, filepath)
+        discard_ranged_download(part_path, state_path)
+        return True
+
+    save_range_state(state_path, state)
+    unsupported = [e for e in errors if isinstance(e, RangesUnsupported)]
+    if unsupported:
+        print(f"\nRanged download of {filename} not possible, using a single stream: {unsupported[0]}")
+        discard_ranged_download(part_path, state_path)
+        return None
+    failures = [e for e in errors if not isinstance(e, DownloadCancelled)]
+    if failures:
+        print(f"\nRanged download of {filename} failed: {failures[0]}")
+    return False
+
+def resume_headers(initial_pos, etag=None):
+    """
+    Build the request headers for continuing a download from initial_pos.
+    With If-Range the server only honours the range if the file is unchanged,
+    otherwise it sends the whole file in the same response.
+    """
+    headers = {}
+    if initial_pos > 0:
+        headers['Range'] = f'bytes={initial_pos}-'
+        if etag:
+            headers['If-Range'] = etag
+    return headers
+
+def download_file(url, filename, output_dir, expected_size=None, max_retries=5, accepts_ranges=None):
     """
     Download a single file with resume support
     """
     filepath = os.path.join(output_dir, filename)
+    # ETag of the partial file, kept next to it so resumes can send If-Range
+    etag_path = filepath + '.etag'
     
     # Check local file size
-    initial_pos = 0
-    if os.path.exists(filepath):
-        initial_pos = os.path.getsize(filepath)
+    try:
+        initial_pos = os.stat(filepath).st_size
+    except FileNotFoundError:
+        initial_pos = 0
+    else:
         if expected_size and initial_pos == expected_size:
             print(f"File exists and size matches, skipping: {filename}")
             return True
@@ -81,15 +547,38 @@ def download_file(url, filename, output_dir, expected_size=None, max_retries=5):
         else:
             print(f"Found incomplete download, resuming from {initial_pos} bytes: {filename}")
 
-    mode = 'ab' if initial_pos > 0 else 'wb'
-    headers = {}
+    # Large fresh downloads are split into parallel byte ranges when possible;
+    # an interrupted ranged download continues from its saved ranges
+    if initial_pos == 0 and expected_size and expected_size >= RANGED_DOWNLOAD_MIN_SIZE:
+        result = download_file_ranged(url, filepath, expected_size, parts=RANGED_DOWNLOAD_PARTS,
+                                      accepts_ranges=accepts_ranges, max_retries=max_retries)
+        if result:
+            print(f"Download complete: {filename}")
+            return True
+        if result is False:
+            print(f"File {filename} incomplete, progress kept for the next attempt.")
+            return False
+
+    etag = None
     if initial_pos > 0:
-        headers['Range'] = f'bytes={initial_pos}-'
+        try:
+            with open(etag_path) as f:
+                etag = f.read().strip() or None
+        except OSError:
+            pass
+
+    mode = 'ab' if initial_pos > 0 else 'wb'
+    headers = resume_headers(initial_pos, etag)
+
+    # Bytes of the file known to be on disk, kept current from the open handle
+    local_size = initial_pos
 
     retry_count = 0
     while retry_count < max_retries:
+        if CANCEL.is_set():
+            return False
         try:
-            with requests.get(url, headers=headers, stream=True, timeout=30) as r:
+            with CONNECTION_SLOTS, SESSION.get(url, headers=headers, stream=True, timeout=30) as r:
                 r.raise_for_status()
                 
                 # Get total size
@@ -107,40 +596,126 @@ def download_file(url, filename, output_dir, expected_size=None, max_retries=5):
                         mode = 'wb'
                         total_size = int(r.headers.get('content-length', 0))
 
+                if r.status_code == 200:
+                    # Remember the ETag of a full response for later resumes;
+                    # weak validators cannot be used with If-Range
+                    etag = r.headers.get('ETag')
+                    if etag and not etag.startswith('W/'):
+                        with open(etag_path, 'w') as f:
+                            f.write(etag)
+                    else:
+                        etag = None
+                        if os.path.exists(etag_path):
+                            os.remove(etag_path)
+
                 # Progress bar
-                with tqdm(total=total_size, unit='B', unit_scale=True, desc=filename, initial=initial_pos) as pbar:
-                    with open(filepath, mode) as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                pbar.update(len(chunk))
+                with tqdm(total=total_size, desc=filename, initial=initial_pos, **PROGRESS_OPTIONS) as pbar:
+                    # Unbuffered, so every write lands in the file at once and the
+                    # fstat-based progress sees exact sizes (BufferedWriter would
+                    # pass chunks this large through unchanged anyway)
+                    with io.FileIO(filepath, mode) as f:
+                        if mode == 'wb' and expected_size:
+                            preallocate_file(f, expected_size)
+                        # Zenodo serves files as-is; only run the decoder if the
+                        # server actually applied a Content-Encoding
+                        r.raw.decode_content = has_content_encoding(r)
+                        # Poll the file size for progress instead of updating
+                        # the bar from Python for every chunk
+                        stop = threading.Event()
+                        watcher = threading.Thread(target=track_progress, args=(pbar, f, stop), daemon=True)
+                        watcher.start()
+                        try:
+                            copy_stream(r.raw, f)
+                        finally:
+                            stop.set()
+                            watcher.join()
+                            local_size = os.fstat(f.fileno()).st_size
+                            pbar.n = local_size
+                            pbar.refresh()
             
             # Verify download completion
-            if expected_size and os.path.getsize(filepath) != expected_size:
+            if expected_size and local_size != expected_size:
                 raise Exception("File size mismatch after download")
             
+            if os.path.exists(etag_path):
+                os.remove(etag_path)
             print(f"Download complete: {filename}")
             return True
 
         except Exception as e:
+            if CANCEL.is_set():
+                return False
             retry_count += 1
             print(f"\nDownload error ({retry_count}/{max_retries}): {e}")
-            print("Retrying in 5 seconds...")
-            time.sleep(5)
+            delay = backoff_delay(retry_count, base=2.0, cap=60.0)
+            print(f"Retrying in {delay:.1f} seconds...")
+            if CANCEL.wait(delay):
+                return False
             
             # Update header for next loop with latest file size
-            if os.path.exists(filepath):
-                initial_pos = os.path.getsize(filepath)
-                headers['Range'] = f'bytes={initial_pos}-'
+            if local_size > 0:
+                initial_pos = local_size
                 mode = 'ab'
             else:
                 initial_pos = 0
-                headers = {}
                 mode = 'wb'
+            headers = resume_headers(initial_pos, etag)
 
     print(f"File {filename} failed to download after max retries.")
     return False
 
+def download_all(jobs, output_dir):
+    """
+    Download (filename, url, size, accepts_ranges) jobs concurrently until all succeed.
+    A failed file is rescheduled on its own with jittered exponential backoff
+    while the other downloads keep running.
+    """
+    scheduler = sched.scheduler(time.monotonic, time.sleep)
+    futures = {}
+
+    # Socket reads release the GIL, so threads scale for network-bound work
+    executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+
+    def submit(job, attempt):
+        filename, download_url, size, accepts_ranges = job
+        print(f"\nPreparing to download: {filename} (Size: {size} bytes)")
+        future = executor.submit(download_file, download_url, filename, output_dir,
+                                 expected_size=size, accepts_ranges=accepts_ranges)
+        futures[future] = (job, attempt)
+
+    try:
+        for job in jobs:
+            submit(job, 1)
+
+        while futures or not scheduler.empty():
+            # Start retries that are due; returns the time until the next one
+            next_retry = scheduler.run(blocking=False)
+            if not futures:
+                time.sleep(next_retry)
+                continue
+
+            done, _ = wait(futures, timeout=next_retry, return_when=FIRST_COMPLETED)
+            for future in done:
+                job, attempt = futures.pop(future)
+                try:
+                    success = future.result()
+                except Exception as e:
+                    print(f"\nUnexpected error while downloading {job[0]}: {e}")
+                    success = False
+                if not success:
+                    delay = backoff_delay(attempt, base=10.0, cap=300.0)
+                    print(f"File {job[0]} failed, retrying in {delay:.1f} seconds...")
+                    scheduler.enter(delay, 1, submit, (job, attempt + 1))
+    except KeyboardInterrupt:
+        # Leaving the executor's context would wait for every in-flight download
+        # to finish; stop them at their next chunk and drop queued files instead
+        CANCEL.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+        raise
+    executor.shutdown()
+
 def main():
     print("=== Zenodo Dataset Downloader ===")
     user_input = input("Enter Zenodo URL or Record ID (e.g., https://zenodo.org/record/1234567): ").strip()
@@ -152,7 +727,7 @@ def main():
 
     print(f"Detected Record ID: {record_id}")
     
-    metadata = get_record_metadata(record_id)
+    metadata, metadata_etag = get_record_metadata(record_id, cache_path=find_metadata_cache(record_id))
     if not metadata:
         return
 
@@ -161,7 +736,7 @@ def main():
 
     title = metadata.get('metadata', {}).get('title', 'Untitled_Dataset')
     # Clean illegal characters in filename
-    safe_title = "".join([c for c in title if c.isalpha() or c.isdigit() or c in (' ', '-', '_')]).strip()
+    safe_title = sanitize_title(title)
     output_dir = os.path.join(os.getcwd(), f"Zenodo_{record_id}_{safe_title}")
     
     if not os.path.exists(output_dir):
@@ -170,63 +745,70 @@ def main():
     else:
         print(f"Using download directory: {output_dir}")
 
+    cache_path = os.path.join(output_dir, METADATA_CACHE_NAME)
+    if not os.path.exists(cache_path):
+        save_metadata_cache(cache_path, metadata, metadata_etag)
+
     files = metadata.get('files', [])
     print(f"Found {len(files)} files.")
 
-    global_pass = 1
-    while True:
-        all_downloaded = True
-        files_to_download_count = 0
+    # Sizes of files already on disk, from a single directory scan
+    with os.scandir(output_dir) as entries:
+        existing = {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+
+    files_to_download_count = 0
+    candidates = []
+    for file_info in files:
+        # Zenodo API response structure may change, handle compatibility
+        # Old API: 'links': {'self': '...'}, 'key': 'filename'
+        # New API: 'links': {'content': '...'}, 'key': 'filename' (API v1) 
+        # Sometimes it is 'filename' field
         
-        print(f"\n=== Starting download pass {global_pass} ===")
+        filename = file_info.get('key') or file_info.get('filename')
+        download_url = file_info.get('links', {}).get('self') or file_info.get('links', {}).get('content')
+        size = file_info.get('size')
 
-        for file_info in files:
-            # Zenodo API response structure may change, handle compatibility
-            # Old API: 'links': {'self': '...'}, 'key': 'filename'
-            # New API: 'links': {'content': '...'}, 'key': 'filename' (API v1) 
-            # Sometimes it is 'filename' field
-            
-            filename = file_info.get('key') or file_info.get('filename')
-            download_url = file_info.get('links', {}).get('self') or file_info.get('links', {}).get('content')
-            size = file_info.get('size')
+        if not filename or not download_url:
+            print(f"Skipping unparseable file info: {file_info}")
+            continue
 
-            if not filename or not download_url:
-                print(f"Skipping unparseable file info: {file_info}")
-                continue
+        if filter_keyword and filter_keyword.lower() not in filename.lower():
+            # print(f"Skipping file not matching filter: {filename}")
+            continue
+        
+        files_to_download_count += 1
+
+        # Quick check if completed before calling download_file to avoid excessive logs
+        if size and existing.get(filename) == size:
+            # print(f"File exists and size matches, skipping: {filename}")
+            continue
+
+        candidates.append((filename, download_url, size))
 
-            if filter_keyword and filter_keyword.lower() not in filename.lower():
-                # print(f"Skipping file not matching filter: {filename}")
+    # Metadata sizes can be missing or stale for re-versioned files, so confirm
+    # size and Range support for the remaining files with concurrent HEAD requests
+    jobs = []
+    if candidates:
+        print(f"Checking {len(candidates)} files on the server...")
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            probes = list(executor.map(probe_file, [download_url for _, download_url, _ in candidates]))
+        for (filename, download_url, size), (probed_size, accepts_ranges) in zip(candidates, probes):
+            size = probed_size or size
+            if size and existing.get(filename) == size:
                 continue
-            
-            files_to_download_count += 1
-
-            # Quick check if completed before calling download_file to avoid excessive logs
-            filepath = os.path.join(output_dir, filename)
-            if os.path.exists(filepath):
-                initial_pos = os.path.getsize(filepath)
-                if size and initial_pos == size:
-                    # print(f"File exists and size matches, skipping: {filename}")
-                    continue
-
-            print(f"\nPreparing to download: {filename} (Size: {size} bytes)")
-            success = download_file(download_url, filename, output_dir, expected_size=size)
-            if not success:
-                print(f"File {filename} failed, will retry in next pass.")
-                all_downloaded = False
-        
-        if files_to_download_count == 0:
-             print("No matching files found.")
-             break
+            jobs.append((filename, download_url, size, accepts_ranges))
 
-        if all_downloaded:
-            print(f"\nAll {files_to_download_count} files downloaded successfully!")
-            break
-        else:
-            print(f"\nPass {global_pass} completed with failures. Retrying in 10 seconds...")
-            time.sleep(10)
-            global_pass += 1
+    if files_to_download_count == 0:
+        print("No matching files found.")
+    else:
+        download_all(jobs, output_dir)
+        print(f"\nAll {files_to_download_count} files downloaded successfully!")
 
     print("\nAll tasks completed.")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nInterrupted. Run the script again to resume the download.")
+        sys.exit(130)